@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+🧪 Corpus dorado + benchmark del reconocimiento de intenciones
+
+    python bench/bench_intents.py             # verifica el corpus y mide
+    python bench/bench_intents.py --devices 500
+
+Sale con código 1 si alguna frase del corpus cambia de intención.
+"""
+
+import os
+import sys
+import argparse
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from intents import Device, IntentMatcher
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'intents_golden.tsv')
+
+def describe(intent):
+    """Intención → formato compacto del corpus"""
+    parts = [intent.name]
+    if intent.all_devices:
+        parts.append('all')
+    elif intent.devices:
+        parts.append(','.join(str(relay) for relay in intent.devices))
+    if intent.name == 'set_config' and (intent.target or intent.value is not None):
+        value = '' if intent.value is None else f"{intent.value:g}"
+        parts.append(f"{intent.target or ''}={value}")
+    return ':'.join(parts)
+
+def load_corpus(path=CORPUS_PATH):
+    with open(path, encoding='utf-8') as f:
+        return [line.rstrip('\n').split('\t') for line in f
+                if line.strip() and not line.startswith('#')]
+
+def check(matcher, corpus):
+    failures = [(text, expected, describe(matcher.parse(text)))
+                for text, expected in corpus if describe(matcher.parse(text)) != expected]
+    for text, expected, got in failures:
+        print(f"❌ {text!r}: esperado {expected}, obtenido {got}")
+    print(f"{'✅' if not failures else '❌'} Corpus: {len(corpus) - len(failures)}/{len(corpus)}")
+    return not failures
+
+def bench(matcher, corpus, label, repeat=5):
+    texts = [text for text, _ in corpus]
+    number = 200
+    best = min(timeit.repeat(lambda: [matcher.parse(t) for t in texts], number=number, repeat=repeat))
+    per_parse = best / (number * len(texts)) * 1e6
+    print(f"⏱️ {label}: {per_parse:.2f} µs por frase ({len(matcher.table)} palabras en la tabla)")
+    return per_parse
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--devices', type=int, default=1000,
+                        help='dispositivos sintéticos extra para medir el costo con vocabulario grande')
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    matcher = IntentMatcher()
+    ok = check(matcher, corpus)
+    base = bench(matcher, corpus, "vocabulario base")
+
+    big = IntentMatcher()
+    for i in range(args.devices):
+        big.register(Device(100 + i, f'Relay {100 + i}', f'Equipo {i}', (f'equipo{i}', f'aparato{i}')))
+    ok = check(big, corpus) and ok
+    grown = bench(big, corpus, f"+{args.devices} dispositivos")
+    print(f"📈 Relación: {grown / base:.2f}x")
+
+    sys.exit(0 if ok else 1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+🏋️ Prueba de carga del bot sin servicios externos
+
+    python bench/bench_load.py
+    python bench/bench_load.py --chats 50 --messages 20 --publishers 10 --rate 20 --db-ms 20
+
+Levanta un PostgREST falso, un broker MQTT mínimo y una Bot API falsa
+(bench/stubs.py), apunta el bot a ellos con las variables de entorno y
+simula N chats (texto, /status, /temp y notas de voz) mientras M ESP32
+publican lecturas. Cada update pasa por el mismo procesador concurrente
+que en producción. Reporta throughput y latencias p50/p99 por escenario.
+
+gTTS y Google STT no tienen equivalente local: se reemplazan por esperas
+fijas (--tts-ms, --stt-ms) y la transcodificación a WAV por una copia.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+import importlib
+import contextlib
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..'))
+sys.path.insert(0, BENCH_DIR)
+
+from stubs import (FakePostgREST, MiniBroker, FakeBotAPI, SensorPublisher, PHRASES,
+                   fake_recognize, fake_transcode)
+
+TOKEN = "1:bench"
+SCENARIOS = ("texto", "/status", "/temp", "voz")
+
+# gTTS corre en un hilo del proceso principal; STT y transcodificación van al pool
+# de procesos (forkserver), que importa las funciones falsas desde stubs.py y lee
+# su espera de BENCH_STT_MS
+TTS_DELAY = 0.05
+
+class FakeTTS:
+    """Reemplazo de gTTS: misma interfaz, espera fija en vez de llamar a Google"""
+
+    def __init__(self, text, lang='es', slow=False):
+        self.text = text
+
+    def write_to_fp(self, fp):
+        time.sleep(TTS_DELAY)
+        fp.write(b'ID3' + self.text.encode()[:64])
+
+def make_update(scenario, chat_id, update_id):
+    message = {
+        'message_id': update_id, 'date': int(time.time()),
+        'chat': {'id': chat_id, 'type': 'private'},
+        'from': {'id': chat_id, 'is_bot': False, 'first_name': f'chat{chat_id}'},
+    }
+    if scenario == 'texto':
+        message['text'] = PHRASES[update_id % len(PHRASES)]
+    elif scenario == 'voz':
+        message['voice'] = {'file_id': 'voice', 'file_unique_id': 'voice', 'duration': 2}
+    else:
+        message['text'] = scenario
+        message['entities'] = [{'type': 'bot_command', 'offset': 0, 'length': len(scenario)}]
+    return {'update_id': update_id, 'message': message}
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return float('nan')
+    return sorted_values[min(len(sorted_values) - 1, int(p / 100 * len(sorted_values)))]
+
+async def run(args):
+    global TTS_DELAY
+    TTS_DELAY = args.tts_ms / 1000
+
+    db = await FakePostgREST(latency=args.db_ms / 1000).start()
+    api = await FakeBotAPI(TOKEN, latency=args.api_ms / 1000).start()
+    broker = await MiniBroker().start()
+    workdir = tempfile.mkdtemp(prefix="bench_bot_")
+
+    os.environ.update({
+        'TELEGRAM_TOKEN': TOKEN, 'TELEGRAM_API_URL': api.api_url, 'TELEGRAM_FILE_URL': api.file_url,
+        'SUPABASE_URL': db.url, 'MQTT_HOST': broker.host, 'MQTT_PORT': str(broker.port), 'MQTT_TLS': '0',
+        'WRITE_JOURNAL_PATH': os.path.join(workdir, 'journal.db'),
+        'STATE_SNAPSHOT_PATH': os.path.join(workdir, 'state.json'),
+        'METRICS_PORT': '0', 'UPDATE_CONCURRENCY': str(args.concurrency),
+        'BENCH_STT_MS': str(args.stt_ms),
+    })
+    os.environ.pop('TTS_CACHE_DIR', None)
+    os.environ.pop('WEBHOOK_URL', None)
+    bot = importlib.import_module('bot_final')
+    bot.gTTS = FakeTTS
+    bot.recognize_voice = fake_recognize
+    bot.transcode_esp32_wav = fake_transcode
+    bot.VOICE_ENABLED = bot.AUDIO_ENABLED = True
+
+    latencies = {scenario: [] for scenario in SCENARIOS}
+    log = open(os.devnull, 'w') if not args.verbose else sys.stdout
+    with contextlib.redirect_stdout(log):
+        app = bot.build_application()
+        await app.initialize()
+        await bot.post_init(app)
+        for _ in range(100):
+            if bot.mqtt_connected:
+                break
+            await asyncio.sleep(0.05)
+
+        stop = asyncio.Event()
+        publishers = [SensorPublisher(f"bench{i}", broker.host, broker.port, args.rate)
+                      for i in range(args.publishers)]
+        publisher_tasks = [asyncio.create_task(p.run(stop)) for p in publishers]
+
+        update_ids = iter(range(1, 1 << 31))
+
+        async def chat(chat_id):
+            for k in range(args.messages):
+                scenario = SCENARIOS[(chat_id + k) % len(SCENARIOS)]
+                update = bot.Update.de_json(make_update(scenario, chat_id, next(update_ids)), app.bot)
+                done = asyncio.get_running_loop().create_future()
+
+                async def tracked():
+                    try:
+                        await app.process_update(update)
+                    finally:
+                        done.set_result(None)
+
+                # El procesador encola y vuelve enseguida: se espera a que el update termine
+                start = time.perf_counter()
+                await app.update_processor.process_update(update, tracked())
+                await done
+                latencies[scenario].append(time.perf_counter() - start)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(chat(1000 + i) for i in range(args.chats)))
+        elapsed = time.perf_counter() - started
+
+        stop.set()
+        await asyncio.gather(*publisher_tasks)
+        await asyncio.sleep(0.2)
+        inbox = bot.mqtt_inbox.stats()
+        await app.shutdown()
+        await bot.post_shutdown(app)
+
+    await asyncio.gather(db.stop(), api.stop(), broker.stop())
+
+    total = sum(len(values) for values in latencies.values())
+    print(f"🏋️ {args.chats} chats × {args.messages} mensajes, {args.publishers} ESP32 a {args.rate:g} Hz, "
+          f"concurrencia {args.concurrency}")
+    print(f"{'escenario':<10}{'n':>6}{'p50 ms':>10}{'p99 ms':>10}")
+    for scenario, values in latencies.items():
+        values.sort()
+        print(f"{scenario:<10}{len(values):>6}{percentile(values, 50) * 1000:>10.1f}"
+              f"{percentile(values, 99) * 1000:>10.1f}")
+    print(f"⚡ {total} updates en {elapsed:.2f}s → {total / elapsed:.1f} updates/s")
+    print(f"📡 MQTT: {sum(p.sent for p in publishers)} publicadas, {inbox['received']} recibidas, "
+          f"{inbox['processed']} procesadas, {inbox['coalesced']} fusionadas, {inbox['dropped']} descartadas")
+    print(f"🗄️ Supabase: {db.requests} peticiones | 📨 Bot API: {len(api.calls)} llamadas")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--chats', type=int, default=20, help='chats simulados en paralelo')
+    parser.add_argument('--messages', type=int, default=10, help='mensajes por chat (uno tras otro)')
+    parser.add_argument('--publishers', type=int, default=5, help='ESP32 simulados publicando lecturas')
+    parser.add_argument('--rate', type=float, default=10, help='lecturas por segundo de cada ESP32')
+    parser.add_argument('--concurrency', type=int, default=16, help='updates procesados a la vez (UPDATE_CONCURRENCY)')
+    parser.add_argument('--db-ms', type=float, default=5, help='latencia del PostgREST falso')
+    parser.add_argument('--api-ms', type=float, default=5, help='latencia de la Bot API falsa')
+    parser.add_argument('--tts-ms', type=float, default=50, help='duración simulada de gTTS')
+    parser.add_argument('--stt-ms', type=float, default=200, help='duración simulada de Google STT')
+    parser.add_argument('--verbose', action='store_true', help='mostrar los logs del bot')
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == '__main__':
+    main()
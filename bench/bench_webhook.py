@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+🪝 Prueba del listener del webhook (HTTP o HTTPS) sin Telegram
+
+    python bench/bench_webhook.py
+    python bench/bench_webhook.py --tls --chats 50 --messages 10
+
+Levanta el mismo listener que run_webhook (start_webhook_server) delante de
+los servidores falsos de bench/stubs.py y le hace POST como Telegram:
+
+✅ Respuestas: 200 con el secreto correcto, 403 sin él, 404 en otra ruta o
+   con GET, 413 sin cuerpo y 400 con JSON que no es un update
+✅ Carga: N chats envían M mensajes; mide la latencia del 200 (acuse) y el
+   tiempo hasta que todas las respuestas llegan a la Bot API falsa
+
+Con --tls genera un certificado autofirmado (openssl) y lo verifica como
+haría Telegram con uno subido en setWebhook. Sale con código 1 si algo falla.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+import importlib
+import contextlib
+import subprocess
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..'))
+sys.path.insert(0, BENCH_DIR)
+
+import httpx
+from stubs import FakePostgREST, MiniBroker, FakeBotAPI
+from bench_load import TOKEN, FakeTTS, make_update, percentile
+
+SECRET = "bench-secret"
+PATH = "/hook"
+
+def self_signed_cert(workdir):
+    cert, key = os.path.join(workdir, 'cert.pem'), os.path.join(workdir, 'key.pem')
+    subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+                    "-subj", "/CN=127.0.0.1", "-addext", "subjectAltName=IP:127.0.0.1",
+                    "-keyout", key, "-out", cert], check=True, capture_output=True)
+    return cert, key
+
+async def check_responses(client, url):
+    """(descripción, código esperado, código recibido) de cada caso"""
+    update = make_update('texto', 1, 1)
+    good = {'X-Telegram-Bot-Api-Secret-Token': SECRET}
+    cases = [
+        ("update válido", 200, client.post(url + PATH, json=update, headers=good)),
+        ("sin secreto", 403, client.post(url + PATH, json=update)),
+        ("secreto incorrecto", 403, client.post(url + PATH, json=update,
+                                                 headers={'X-Telegram-Bot-Api-Secret-Token': 'x'})),
+        ("otra ruta", 404, client.post(url + "/otra", json=update, headers=good)),
+        ("GET", 404, client.get(url + PATH, headers=good)),
+        ("cuerpo vacío", 413, client.post(url + PATH, content=b'', headers=good)),
+        ("JSON inválido", 400, client.post(url + PATH, content=b'{roto', headers=good)),
+        ("JSON que no es update", 400, client.post(url + PATH, json=[1, 2], headers=good)),
+    ]
+    results = []
+    for name, expected, request in cases:
+        response = await request
+        results.append((name, expected, response.status_code))
+    return results
+
+async def run(args):
+    db = await FakePostgREST(latency=args.db_ms / 1000).start()
+    api = await FakeBotAPI(TOKEN, latency=args.api_ms / 1000).start()
+    broker = await MiniBroker().start()
+    workdir = tempfile.mkdtemp(prefix="bench_webhook_")
+    cert, key = self_signed_cert(workdir) if args.tls else ("", "")
+
+    os.environ.update({
+        'TELEGRAM_TOKEN': TOKEN, 'TELEGRAM_API_URL': api.api_url, 'TELEGRAM_FILE_URL': api.file_url,
+        'SUPABASE_URL': db.url, 'MQTT_HOST': broker.host, 'MQTT_PORT': str(broker.port), 'MQTT_TLS': '0',
+        'WRITE_JOURNAL_PATH': os.path.join(workdir, 'journal.db'),
+        'STATE_SNAPSHOT_PATH': os.path.join(workdir, 'state.json'),
+        'METRICS_PORT': '0', 'UPDATE_CONCURRENCY': str(args.concurrency),
+        'WEBHOOK_SECRET': SECRET,
+    })
+    os.environ.pop('TTS_CACHE_DIR', None)
+    bot = importlib.import_module('bot_final')
+    bot.gTTS = FakeTTS
+
+    log = open(os.devnull, 'w') if not args.verbose else sys.stdout
+    with contextlib.redirect_stdout(log):
+        app = bot.build_application()
+        await app.initialize()
+        await bot.post_init(app)
+        await app.start()
+        server = await bot.start_webhook_server(app, PATH, '127.0.0.1', 0, cert, key)
+        port = server.sockets[0].getsockname()[1]
+        url = f"{'https' if args.tls else 'http'}://127.0.0.1:{port}"
+
+        async with httpx.AsyncClient(verify=cert or True, timeout=10) as client:
+            results = await check_responses(client, url)
+
+            calls_before = len(api.calls)
+            acks = []
+            update_ids = iter(range(100, 1 << 31))
+            headers = {'X-Telegram-Bot-Api-Secret-Token': SECRET}
+
+            async def chat(chat_id):
+                for k in range(args.messages):
+                    scenario = ('texto', '/status')[k % 2]
+                    start = time.perf_counter()
+                    response = await client.post(url + PATH, headers=headers,
+                                                 json=make_update(scenario, chat_id, next(update_ids)))
+                    acks.append(time.perf_counter() - start)
+                    if response.status_code != 200:
+                        raise RuntimeError(f"webhook respondió {response.status_code}")
+
+            started = time.perf_counter()
+            await asyncio.gather(*(chat(1000 + i) for i in range(args.chats)))
+            acked = time.perf_counter() - started
+            # Hasta que no queden updates en cola ni en proceso, ni audios de fondo
+            deadline = time.perf_counter() + 30
+            while time.perf_counter() < deadline and (
+                    app.update_queue.qsize() or app.update_processor._drainers or bot._background_tasks):
+                await asyncio.sleep(0.01)
+            answered = time.perf_counter() - started
+            replied = {chat_id for _, chat_id, _ in api.calls[calls_before:]}
+
+        server.close()
+        await server.wait_closed()
+        await app.stop()
+        await app.shutdown()
+        await bot.post_shutdown(app)
+
+    await asyncio.gather(db.stop(), api.stop(), broker.stop())
+
+    failed = False
+    print(f"🪝 Webhook {'HTTPS' if args.tls else 'HTTP'} en {url}{PATH}")
+    for name, expected, status in results:
+        ok = expected == status
+        failed |= not ok
+        print(f"{'✅' if ok else '❌'} {name:<24}{status} (esperado {expected})")
+
+    acks.sort()
+    missing = args.chats - len(replied & set(range(1000, 1000 + args.chats)))
+    failed |= missing > 0
+    print(f"⚡ {args.chats * args.messages} updates: acuse p50 {percentile(acks, 50) * 1000:.1f} ms, "
+          f"p99 {percentile(acks, 99) * 1000:.1f} ms; todos aceptados en {acked:.2f}s, "
+          f"respondidos en {answered:.2f}s")
+    if missing:
+        print(f"❌ {missing} chats sin respuesta")
+    return 1 if failed else 0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tls', action='store_true', help='servir HTTPS con un certificado autofirmado')
+    parser.add_argument('--chats', type=int, default=20, help='chats enviando en paralelo')
+    parser.add_argument('--messages', type=int, default=10, help='mensajes por chat')
+    parser.add_argument('--concurrency', type=int, default=16, help='updates procesados a la vez (UPDATE_CONCURRENCY)')
+    parser.add_argument('--db-ms', type=float, default=5, help='latencia del PostgREST falso')
+    parser.add_argument('--api-ms', type=float, default=5, help='latencia de la Bot API falsa')
+    parser.add_argument('--verbose', action='store_true', help='mostrar los logs del bot')
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,407 @@
+"""
+🧪 Servidores falsos para los benchmarks (solo biblioteca estándar, asyncio)
+
+✅ FakePostgREST: tablas en memoria con los filtros que usa el bot
+   (eq., in.(...), order, limit) + latencia configurable
+✅ MiniBroker: broker MQTT 3.1.1 mínimo (CONNECT, SUBSCRIBE con + y #,
+   PUBLISH QoS 0/1, PING) suficiente para paho y para los publicadores
+✅ FakeBotAPI: Bot API de Telegram que acepta sendMessage, sendVoice, etc.
+   y registra cada llamada por chat
+✅ SensorPublisher: ESP32 simulado que publica lecturas a una frecuencia fija
+✅ fake_recognize / fake_transcode: reemplazos de STT y transcodificación que
+   corren en el pool de audio (importables por los workers de forkserver)
+"""
+
+import os
+import re
+import json
+import time
+import random
+import asyncio
+import struct
+from urllib.parse import urlsplit, parse_qs
+
+# ========================================
+# HTTP MÍNIMO (keep-alive)
+# ========================================
+
+class HttpStub:
+    """Servidor HTTP/1.1 con keep-alive; las subclases implementan handle()"""
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.requests = 0
+        self._server = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _serve(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+                self.requests += 1
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                status, content_type, payload = await self.handle(method, target, headers, body)
+                writer.write(f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                             f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def handle(self, method, target, headers, body):
+        raise NotImplementedError
+
+def json_response(obj, status="200 OK"):
+    return status, "application/json", json.dumps(obj).encode()
+
+# ========================================
+# SUPABASE (PostgREST)
+# ========================================
+
+class FakePostgREST(HttpStub):
+    """Subconjunto de PostgREST que usa el bot, sobre listas en memoria"""
+
+    TABLES = ("sensor_readings", "relay_states", "system_config", "system_alerts")
+
+    def __init__(self, latency=0.0, **kwargs):
+        super().__init__(latency=latency, **kwargs)
+        self.tables = {name: [] for name in self.TABLES}
+        self._ids = {name: 0 for name in self.TABLES}
+        self.insert('system_config', [{'setpoint': 24, 'hysteresis': 2, 'temp_max': 30, 'temp_min': 18}])
+        self.insert('sensor_readings', [{'temperatura': 24.0, 'humedad': 55, 'setpoint': 24}])
+
+    def insert(self, table, rows):
+        now = time.strftime('%Y-%m-%dT%H:%M:%S')
+        for row in rows:
+            self._ids[table] += 1
+            row.setdefault('id', self._ids[table])
+            row.setdefault('created_at', now)
+            self.tables[table].append(row)
+        return rows
+
+    @staticmethod
+    def _matches(row, column, condition):
+        op, _, value = condition.partition('.')
+        value = value.strip('"')
+        if op == 'is':
+            return row.get(column) is None if value == 'null' else str(row.get(column)).lower() == value
+        if op == 'eq':
+            return str(row.get(column)) == value
+        if op == 'in':
+            return str(row.get(column)) in value.strip('()').split(',')
+        if op in ('gt', 'lt', 'gte', 'lte'):
+            current = row.get(column)
+            if isinstance(current, (int, float)):
+                value = float(value)
+            else:
+                current = str(current)
+            return {'gt': current > value, 'lt': current < value,
+                    'gte': current >= value, 'lte': current <= value}[op]
+        return True
+
+    @staticmethod
+    def _split_terms(expr):
+        """Separa por comas de primer nivel (fuera de paréntesis y comillas)"""
+        terms, depth, quoted, start = [], 0, False, 0
+        for i, c in enumerate(expr):
+            if c == '"':
+                quoted = not quoted
+            elif not quoted and c == '(':
+                depth += 1
+            elif not quoted and c == ')':
+                depth -= 1
+            elif not quoted and c == ',' and depth == 0:
+                terms.append(expr[start:i])
+                start = i + 1
+        terms.append(expr[start:])
+        return terms
+
+    def _logic(self, row, op, expr):
+        """or=(a.gt.1,and(b.eq.2,c.gt.3)) y and=(...), como en PostgREST"""
+        results = []
+        for term in self._split_terms(expr[1:-1]):
+            if term.startswith(('and(', 'or(')):
+                name, _, inner = term.partition('(')
+                results.append(self._logic(row, name, '(' + inner))
+            else:
+                column, _, condition = term.partition('.')
+                results.append(self._matches(row, column, condition))
+        return any(results) if op == 'or' else all(results)
+
+    def _select(self, table, query):
+        rows = self.tables[table]
+        for column, conditions in query.items():
+            if column in ('select', 'order', 'limit'):
+                continue
+            for condition in conditions:
+                if column in ('or', 'and'):
+                    rows = [row for row in rows if self._logic(row, column, condition)]
+                else:
+                    rows = [row for row in rows if self._matches(row, column, condition)]
+        for order in reversed(query.get('order', [''])[0].split(',')):
+            if order:
+                column, _, direction = order.partition('.')
+                rows = sorted(rows, key=lambda row: (isinstance(row.get(column), str), row.get(column) or 0),
+                              reverse=direction == 'desc')
+        if 'limit' in query:
+            rows = rows[:int(query['limit'][0])]
+        return rows
+
+    async def handle(self, method, target, headers, body):
+        parts = urlsplit(target)
+        table = parts.path.rsplit('/', 1)[-1]
+        if table not in self.tables:
+            return json_response({'message': f'relation {table} does not exist'}, "404 Not Found")
+        query = parse_qs(parts.query)
+
+        if method == 'GET':
+            return json_response(self._select(table, query))
+        if method == 'POST':
+            rows = json.loads(body)
+            return json_response(self.insert(table, rows if isinstance(rows, list) else [rows]), "201 Created")
+        if method == 'PATCH':
+            changes = json.loads(body)
+            rows = self._select(table, query)
+            for row in rows:
+                row.update(changes)
+            return json_response(rows)
+        return json_response({'message': 'method not allowed'}, "405 Method Not Allowed")
+
+# ========================================
+# TELEGRAM (Bot API)
+# ========================================
+
+class FakeBotAPI(HttpStub):
+    """Bot API falsa: responde como Telegram y guarda (método, chat_id, hora) de cada llamada"""
+
+    def __init__(self, token, latency=0.0, voice_bytes=b'OggS' + bytes(2048), **kwargs):
+        super().__init__(latency=latency, **kwargs)
+        self.token = token
+        self.voice_bytes = voice_bytes
+        self.calls = []
+        self._message_ids = 0
+
+    @property
+    def api_url(self):
+        return f"{self.url}/bot"
+
+    @property
+    def file_url(self):
+        return f"{self.url}/file/bot"
+
+    @staticmethod
+    def _chat_id(headers, body):
+        if headers.get('content-type', '').startswith('multipart/'):
+            match = re.search(rb'name="chat_id"\r\n\r\n(-?\d+)', body)
+            return int(match.group(1)) if match else None
+        values = parse_qs(body.decode())
+        return int(values['chat_id'][0]) if 'chat_id' in values else None
+
+    def _message(self, chat_id, **extra):
+        self._message_ids += 1
+        return {'message_id': self._message_ids, 'date': int(time.time()),
+                'chat': {'id': chat_id or 0, 'type': 'private'}, **extra}
+
+    async def handle(self, method, target, headers, body):
+        path = urlsplit(target).path
+        if path.startswith(f"/file/bot{self.token}/"):
+            return "200 OK", "application/octet-stream", self.voice_bytes
+
+        api_method = path.rsplit('/', 1)[-1]
+        chat_id = self._chat_id(headers, body)
+        self.calls.append((api_method, chat_id, time.perf_counter()))
+
+        if api_method == 'getMe':
+            result = {'id': 1, 'is_bot': True, 'first_name': 'Bench', 'username': 'bench_bot'}
+        elif api_method == 'getFile':
+            result = {'file_id': 'voice', 'file_unique_id': 'voice', 'file_size': len(self.voice_bytes),
+                      'file_path': 'voice/file.oga'}
+        elif api_method == 'sendPhoto':
+            result = self._message(chat_id, photo=[{'file_id': 'photo', 'file_unique_id': 'photo',
+                                                    'width': 600, 'height': 300}])
+        elif api_method.startswith('send'):
+            result = self._message(chat_id, text='')
+        else:
+            result = True
+        return json_response({'ok': True, 'result': result})
+
+# ========================================
+# MQTT
+# ========================================
+
+def _encode_length(n):
+    out = bytearray()
+    while True:
+        byte, n = n % 128, n // 128
+        out.append(byte | (0x80 if n else 0))
+        if not n:
+            return bytes(out)
+
+def _packet(packet_type, flags, body):
+    return bytes([packet_type << 4 | flags]) + _encode_length(len(body)) + body
+
+def _string(value):
+    data = value.encode()
+    return struct.pack('>H', len(data)) + data
+
+async def _read_packet(reader):
+    header = (await reader.readexactly(1))[0]
+    length, shift = 0, 0
+    while True:
+        byte = (await reader.readexactly(1))[0]
+        length |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            break
+    return header >> 4, header & 0x0F, await reader.readexactly(length)
+
+def topic_matches(pattern, topic):
+    pattern_parts, topic_parts = pattern.split('/'), topic.split('/')
+    for i, part in enumerate(pattern_parts):
+        if part == '#':
+            return True
+        if i >= len(topic_parts) or (part != '+' and part != topic_parts[i]):
+            return False
+    return len(pattern_parts) == len(topic_parts)
+
+class MiniBroker:
+    """Broker MQTT 3.1.1 mínimo: reenvía todo con QoS 0 a los suscriptores"""
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self.host = host
+        self.port = port
+        self.published = 0
+        self.delivered = 0
+        self._clients = {}         # writer → lista de filtros
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._clients):
+                writer.close()
+            await self._server.wait_closed()
+
+    def _route(self, topic, message):
+        for writer, filters in self._clients.items():
+            if any(topic_matches(f, topic) for f in filters):
+                writer.write(message)
+                self.delivered += 1
+
+    async def _serve(self, reader, writer):
+        self._clients[writer] = []
+        try:
+            while True:
+                packet_type, flags, body = await _read_packet(reader)
+                if packet_type == 1:                           # CONNECT
+                    writer.write(_packet(2, 0, b'\x00\x00'))
+                elif packet_type == 3:                         # PUBLISH
+                    qos = (flags >> 1) & 0x03
+                    topic_len = struct.unpack('>H', body[:2])[0]
+                    topic = body[2:2 + topic_len].decode()
+                    offset = 2 + topic_len
+                    if qos:
+                        writer.write(_packet(4, 0, body[offset:offset + 2]))
+                        offset += 2
+                    self.published += 1
+                    self._route(topic, _packet(3, 0, _string(topic) + body[offset:]))
+                elif packet_type == 8:                         # SUBSCRIBE
+                    packet_id, offset, granted = body[:2], 2, b''
+                    while offset < len(body):
+                        length = struct.unpack('>H', body[offset:offset + 2])[0]
+                        self._clients[writer].append(body[offset + 2:offset + 2 + length].decode())
+                        offset += 3 + length
+                        granted += b'\x00'
+                    writer.write(_packet(9, 0, packet_id + granted))
+                elif packet_type == 10:                        # UNSUBSCRIBE
+                    writer.write(_packet(11, 0, body[:2]))
+                elif packet_type == 12:                        # PINGREQ
+                    writer.write(_packet(13, 0, b''))
+                elif packet_type == 14:                        # DISCONNECT
+                    break
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._clients.pop(writer, None)
+            writer.close()
+
+class SensorPublisher:
+    """ESP32 simulado: publica esp32/<id>/sensores a `rate` lecturas por segundo"""
+
+    def __init__(self, device_id, host, port, rate=1.0):
+        self.device_id = device_id
+        self.host = host
+        self.port = port
+        self.rate = rate
+        self.sent = 0
+
+    async def run(self, stop):
+        """Publica hasta que se active el evento `stop`"""
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        connect = _string("MQTT") + bytes([4, 0x02]) + struct.pack('>H', 60) + _string(f"bench-{self.device_id}")
+        writer.write(_packet(1, 0, connect))
+        await _read_packet(reader)
+
+        topic = _string(f"esp32/{self.device_id}/sensores")
+        interval = 1.0 / self.rate
+        temp = random.uniform(20, 26)
+        while not stop.is_set():
+            temp += random.uniform(-0.2, 0.2)
+            payload = json.dumps({'temp': round(temp, 2), 'hum': random.randint(40, 60), 'alert': 'OK'})
+            writer.write(_packet(3, 0, topic + payload.encode()))
+            self.sent += 1
+            await writer.drain()
+            await asyncio.sleep(interval)
+
+        writer.write(_packet(14, 0, b''))
+        await writer.drain()
+        writer.close()
+
+# ========================================
+# AUDIO FALSO (workers del pool)
+# ========================================
+
+PHRASES = ("temperatura", "estado", "enciende luz", "apaga ventilador", "dispositivos", "configuración")
+
+def fake_recognize(ogg_bytes):
+    """Google STT simulado: espera BENCH_STT_MS y devuelve una frase fija"""
+    time.sleep(float(os.environ.get('BENCH_STT_MS', 200)) / 1000)
+    return PHRASES[len(ogg_bytes) % len(PHRASES)]
+
+def fake_transcode(mp3):
+    return mp3
@@ -0,0 +1,133 @@
+"""
+🧠 RECONOCIMIENTO DE INTENCIONES
+Convierte el texto (o la transcripción de voz) en una intención del bot.
+
+✅ Una sola pasada: se tokeniza una vez y cada token se busca en una tabla hash,
+   así el costo no crece con el vocabulario
+✅ Sin acentos ni mayúsculas: "Configuración" == "configuracion"
+✅ Registro de dispositivos: agregar un relay es agregar una línea a DEVICES
+"""
+
+import re
+import unicodedata
+from dataclasses import dataclass, field
+
+# ========================================
+# REGISTRO DE DISPOSITIVOS
+# ========================================
+
+@dataclass(frozen=True)
+class Device:
+    relay: int
+    name: str                     # nombre guardado en Supabase
+    label: str                    # nombre en las respuestas
+    aliases: tuple
+    feminine: bool = False        # "Luz encendida" / "Ventilador encendido"
+
+DEVICES = (
+    Device(1, 'Ventilador', 'Ventilador', ('ventilador', 'ventiladores', 'ventilacion')),
+    Device(2, 'Calefactor', 'Calefactor', ('calefactor', 'calefaccion', 'estufa')),
+    Device(3, 'Humidificador', 'Humidificador', ('humidificador',)),
+    Device(4, 'Foco/Luz', 'Luz', ('luz', 'luces', 'foco', 'focos', 'lampara'), feminine=True),
+)
+
+# ========================================
+# VOCABULARIO
+# ========================================
+
+# palabra (sin acentos) → marca
+KEYWORDS = {
+    'on': ('enciende', 'encender', 'enciendan', 'prende', 'prender', 'prendan', 'activa', 'activar'),
+    'off': ('apaga', 'apagar', 'apaguen', 'desactiva', 'desactivar'),
+    'all': ('todo', 'todos', 'todas'),
+    'set': ('cambia', 'cambiar', 'configura', 'configurar', 'pon', 'poner', 'ajusta', 'ajustar'),
+    'setpoint': ('setpoint', 'objetivo'),
+    'temp_max': ('maxima', 'maximo', 'max'),
+    'temp_min': ('minima', 'minimo', 'min'),
+    'temperature': ('temperatura', 'temp', 'grados', 'clima'),
+    'how_much': ('cuanto', 'cuanta'),
+    'humidity': ('humedad', 'humedo', 'humeda'),
+    'status': ('estado', 'sistema'),
+    'devices': ('dispositivos', 'equipos'),
+    'config': ('configuracion', 'config'),
+    'help': ('ayuda', 'comandos'),
+}
+
+CONFIG_TARGETS = ('setpoint', 'temp_max', 'temp_min')
+
+# Consultas en orden de prioridad cuando el texto menciona varias
+QUERY_PRIORITY = ('temperature', 'humidity', 'how_much', 'status', 'devices', 'config', 'help')
+
+_TOKEN_RE = re.compile(r"[a-z]+|\d+(?:[.,]\d+)?")
+
+def normalize(text):
+    """Minúsculas y sin acentos"""
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+# ========================================
+# MATCHER
+# ========================================
+
+@dataclass
+class Intent:
+    name: str                     # on, off, set_config, temperature, humidity, status, devices, config, help, unknown
+    devices: list = field(default_factory=list)
+    all_devices: bool = False
+    target: str = None            # setpoint, temp_max o temp_min
+    value: float = None
+
+class IntentMatcher:
+    """Tabla token → marcas construida una vez a partir del vocabulario y los dispositivos"""
+
+    def __init__(self, devices=DEVICES, keywords=KEYWORDS):
+        self.devices = {}
+        self.table = {}
+        for mark, words in keywords.items():
+            for word in words:
+                self.table.setdefault(normalize(word), set()).add(mark)
+        for device in devices:
+            self.register(device)
+
+    def register(self, device):
+        self.devices[device.relay] = device
+        for alias in device.aliases:
+            self.table.setdefault(normalize(alias), set()).add(('device', device.relay))
+
+    def parse(self, text):
+        marks = set()
+        devices = []
+        numbers = []
+        for token in _TOKEN_RE.findall(normalize(text)):
+            if token[0].isdigit():
+                numbers.append(token)
+                continue
+            for mark in self.table.get(token, ()):
+                if isinstance(mark, tuple):
+                    if mark[1] not in devices:
+                        devices.append(mark[1])
+                else:
+                    marks.add(mark)
+
+        # Control: "enciende 2" nombra el relay por número
+        for verb in ('on', 'off'):
+            if verb in marks:
+                if not devices:
+                    devices = [int(n) for n in numbers if n.isdigit() and int(n) in self.devices][:1]
+                return Intent(verb, devices=devices, all_devices='all' in marks and not devices)
+
+        # Configuración: verbo explícito o "temperatura mínima 18"
+        target = next((t for t in CONFIG_TARGETS if t in marks), None)
+        if 'set' in marks or (target and numbers):
+            value = float(numbers[0].replace(',', '.')) if numbers else None
+            return Intent('set_config', target=target, value=value)
+
+        for query in QUERY_PRIORITY:
+            if query in marks:
+                return Intent('temperature' if query == 'how_much' else query)
+        return Intent('unknown')
+
+matcher = IntentMatcher()
+
+def parse_intent(text):
+    return matcher.parse(text)
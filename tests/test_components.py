@@ -0,0 +1,290 @@
+"""
+🧪 Pruebas de los componentes sin red (solo biblioteca estándar)
+
+    python -m unittest discover tests
+    python -m pytest -q tests
+
+StateCache, WriteBehindQueue.flush, SensorHistory al dar la vuelta el anillo,
+ThresholdAlertEngine y el go-back-N de AudioStreamSender. Supabase y MQTT se
+reemplazan por objetos en memoria.
+"""
+
+import os
+import sys
+import json
+import zlib
+import asyncio
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+os.environ.setdefault('WRITE_JOURNAL_PATH', os.path.join(tempfile.mkdtemp(prefix="bot_tests_"), 'journal.db'))
+
+import bot_final as bot
+
+# ========================================
+# CACHÉ DE ESTADO
+# ========================================
+
+class StateCacheTest(unittest.TestCase):
+
+    def test_get_respects_max_age(self):
+        cache = bot.StateCache({'sensor': 5, 'config': None})
+        with mock.patch.object(bot.time, 'monotonic', return_value=100.0):
+            cache.put('sensor', {'temp': 20})
+            cache.put('config', {'setpoint': 24})
+        with mock.patch.object(bot.time, 'monotonic', return_value=104.0):
+            self.assertEqual(cache.get('sensor'), {'temp': 20})
+        with mock.patch.object(bot.time, 'monotonic', return_value=106.0):
+            self.assertIsNone(cache.get('sensor'))
+            self.assertEqual(cache.get('config'), {'setpoint': 24})   # sin caducidad
+        self.assertEqual((cache.hits['sensor'], cache.misses['sensor']), (1, 1))
+
+    def test_merge_updates_in_place_and_skips_missing_values(self):
+        cache = bot.StateCache({'relays': 60})
+        cache.merge('relays', {'r1': {'state': True}})
+        self.assertIsNone(cache.get('relays'))
+
+        cache.put('relays', {'r1': {'name': 'Luz', 'state': False, 'mode': 0}})
+        cache.merge('relays', {'r1': {'state': True}})
+        self.assertEqual(cache.get('relays')['r1'], {'name': 'Luz', 'state': True, 'mode': 0})
+
+    def test_invalidate(self):
+        cache = bot.StateCache({'config': None})
+        cache.put('config', {})
+        cache.invalidate('config')
+        self.assertIsNone(cache.get('config'))
+
+    def test_relay_write_adds_named_entry_missing_from_cache(self):
+        """Un relay que no venía de Supabase queda con nombre (antes: KeyError 'name')"""
+        device = bot.DeviceState('test')
+        first, last = sorted(bot.RELAY_NAMES)[0], sorted(bot.RELAY_NAMES)[-1]
+        device.cache.put('relays', {f"r{first}": {'name': 'X', 'state': False, 'mode': 0}})
+        with mock.patch.object(bot.write_queue, 'enqueue'), \
+                mock.patch.object(bot, 'publish_relay_commands'), \
+                mock.patch('sys.stdout'):
+            self.assertTrue(asyncio.run(bot.update_relay_states({last: True}, device=device)))
+
+        relays = device.cache.get('relays')
+        self.assertEqual(relays[f"r{last}"], {'name': bot.RELAY_NAMES[last], 'state': True, 'mode': 3})
+        self.assertTrue(all('name' in relay for relay in relays.values()))
+
+# ========================================
+# ESCRITURAS DIFERIDAS
+# ========================================
+
+class FakeResponse:
+    def __init__(self, status_code, text=""):
+        self.status_code = status_code
+        self.text = text
+
+class FakeSupabase:
+    """Responde a cada POST con el siguiente código de `statuses` (200 al agotarse)"""
+
+    def __init__(self, *statuses):
+        self.statuses = list(statuses)
+        self.posts = []
+
+    async def post(self, path, json=None, **kwargs):
+        self.posts.append((path, json))
+        return FakeResponse(self.statuses.pop(0) if self.statuses else 201)
+
+class WriteBehindQueueTest(unittest.TestCase):
+
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(prefix="journal_"), 'journal.db')
+        self.queue = bot.WriteBehindQueue(self.path, batch_size=10)
+
+    def tearDown(self):
+        self.queue._db.close()
+
+    def flush(self, supabase):
+        with mock.patch.object(bot, 'supabase', supabase), mock.patch('sys.stdout'):
+            return asyncio.run(self.queue.flush())
+
+    def test_flush_groups_rows_by_table_and_columns(self):
+        self.queue.enqueue('relay_states', [{'relay_number': 1, 'state': True}, {'relay_number': 2, 'state': False}])
+        self.queue.enqueue('system_alerts', [{'message': 'a'}])
+        self.queue.enqueue('relay_states', [{'relay_number': 3, 'state': True, 'device_id': 'b'}])
+        supabase = FakeSupabase()
+
+        self.assertTrue(self.flush(supabase))
+        self.assertEqual([(path, len(rows)) for path, rows in supabase.posts],
+                         [('/relay_states', 2), ('/system_alerts', 1), ('/relay_states', 1)])
+        self.assertEqual(self.queue.pending(), 0)
+        self.assertEqual(self.queue.flushed, 4)
+
+    def test_server_error_keeps_rows_for_retry(self):
+        self.queue.enqueue('system_alerts', [{'message': 'a'}, {'message': 'b'}])
+        self.assertFalse(self.flush(FakeSupabase(503)))
+        self.assertEqual(self.queue.pending(), 2)
+        self.assertEqual(self.queue.failures, 1)
+
+        supabase = FakeSupabase()
+        self.assertTrue(self.flush(supabase))
+        self.assertEqual(supabase.posts, [('/system_alerts', [{'message': 'a'}, {'message': 'b'}])])
+        self.assertEqual(self.queue.pending(), 0)
+
+    def test_rejected_rows_are_dropped(self):
+        self.queue.enqueue('system_alerts', [{'bad': 1}])
+        self.assertTrue(self.flush(FakeSupabase(400)))
+        self.assertEqual(self.queue.pending(), 0)
+        self.assertEqual(self.queue.flushed, 0)
+
+    def test_flush_drains_more_than_one_batch(self):
+        self.queue.enqueue('system_alerts', [{'message': str(i)} for i in range(25)])
+        supabase = FakeSupabase()
+        self.assertTrue(self.flush(supabase))
+        self.assertEqual([len(rows) for _, rows in supabase.posts], [10, 10, 5])
+
+    def test_pending_count_survives_reopen(self):
+        self.queue.enqueue('system_alerts', [{'message': 'a'}] * 3)
+        reopened = bot.WriteBehindQueue(self.path)
+        self.assertEqual(reopened.pending(), 3)
+        reopened._db.close()
+
+# ========================================
+# HISTORIAL
+# ========================================
+
+class SensorHistoryTest(unittest.TestCase):
+
+    def test_raw_ring_after_wrap(self):
+        history = bot.SensorHistory(raw_capacity=8, minute_capacity=4, hour_capacity=4)
+        for i in range(20):
+            history.add(float(i), float(i), 50.0)
+
+        stats = history.stats(5, now=19.5)
+        self.assertEqual((stats['min'], stats['max'], stats['count'], stats['resolution']), (15, 19, 5, 0))
+        self.assertAlmostEqual(stats['mean'], 17.0)
+        self.assertEqual(history.series(8, points=4, end=20.0), [12.5, 14.5, 16.5, 18.5])
+
+    def test_window_beyond_raw_uses_minute_buckets(self):
+        history = bot.SensorHistory(raw_capacity=8, minute_capacity=4, hour_capacity=4)
+        for i in range(20):
+            history.add(float(i), float(i), 50.0)
+
+        stats = history.stats(100, now=19.5)
+        self.assertEqual((stats['min'], stats['max'], stats['count'], stats['resolution']), (0, 19, 20, 60))
+        self.assertAlmostEqual(stats['mean'], 9.5)
+
+    def test_minute_ring_after_wrap(self):
+        history = bot.SensorHistory(raw_capacity=2, minute_capacity=4, hour_capacity=4)
+        for i in range(11):
+            history.add(i * 60.0, float(i), 40.0 + i)
+
+        stats = history.stats(180, now=600.5)
+        self.assertEqual((stats['min'], stats['max'], stats['count'], stats['resolution']), (7, 10, 4, 60))
+        self.assertAlmostEqual(stats['mean'], 8.5)
+        self.assertEqual(history.stats(180, metric='hum', now=600.5)['max'], 50)
+        self.assertEqual(history.series(240, points=4, end=660.0), [7.0, 8.0, 9.0, 10.0])
+
+    def test_empty_window(self):
+        history = bot.SensorHistory(raw_capacity=8, minute_capacity=4, hour_capacity=4)
+        self.assertIsNone(history.stats(60, now=100.0))
+        self.assertEqual(history.series(60, points=3, end=100.0), [None, None, None])
+
+# ========================================
+# ALERTAS
+# ========================================
+
+class ThresholdAlertEngineTest(unittest.TestCase):
+    CONFIG = {'tempMax': 30, 'tempMin': 18, 'hysteresis': 2}
+
+    def feed(self, engine, readings):
+        return [engine.evaluate(temp, self.CONFIG, ts) for ts, temp in readings]
+
+    def test_transition_only_after_debounce(self):
+        engine = bot.ThresholdAlertEngine(debounce=10)
+        self.assertEqual(self.feed(engine, [(0, 31), (5, 31), (10, 31), (11, 32)]),
+                         [None, None, ('NORMAL', 'HIGH'), None])
+
+    def test_hysteresis_before_leaving_high(self):
+        engine = bot.ThresholdAlertEngine(debounce=0)
+        self.assertEqual(self.feed(engine, [(0, 31), (1, 29), (2, 28.5), (3, 27)]),
+                         [('NORMAL', 'HIGH'), None, None, ('HIGH', 'NORMAL')])
+
+    def test_spike_restarts_debounce(self):
+        engine = bot.ThresholdAlertEngine(debounce=10)
+        self.assertEqual(self.feed(engine, [(0, 31), (5, 25), (6, 31), (15, 31), (16, 31)]),
+                         [None, None, None, None, ('NORMAL', 'HIGH')])
+
+    def test_low(self):
+        engine = bot.ThresholdAlertEngine(debounce=0)
+        self.assertEqual(self.feed(engine, [(0, 17), (1, 19), (2, 21)]),
+                         [('NORMAL', 'LOW'), None, ('LOW', 'NORMAL')])
+
+# ========================================
+# AUDIO: GO-BACK-N
+# ========================================
+
+class FakeEsp32:
+    """Cliente MQTT falso que hace de ESP32: acepta frames en orden y confirma el último.
+
+    `drop` son números de secuencia cuya primera transmisión se pierde; sin `acks`
+    el ESP32 no responde nunca.
+    """
+
+    def __init__(self, drop=(), acks=True):
+        self.sender = None
+        self.drop = set(drop)
+        self.acks = acks
+        self.sent_frames = []
+        self.received = []
+        self.messages = {}
+
+    def publish(self, topic, payload, qos=0):
+        kind = topic.rsplit('/', 1)[-1]
+        if kind != 'frame':
+            self.messages[kind] = json.loads(payload)
+            return
+        _, seq = bot.AUDIO_FRAME_HEADER.unpack_from(payload)
+        self.sent_frames.append(seq)
+        if seq in self.drop:
+            self.drop.discard(seq)
+            return
+        if seq == len(self.received):
+            self.received.append(payload[bot.AUDIO_FRAME_HEADER.size:])
+        if self.acks and self.received:
+            asyncio.get_running_loop().call_soon(self.sender.on_ack, len(self.received) - 1)
+
+class AudioStreamSenderTest(unittest.TestCase):
+    PAYLOAD = bytes(range(10))
+
+    def send(self, esp32, **kwargs):
+        async def run():
+            sender = bot.AudioStreamSender(esp32, self.PAYLOAD, 'pcm8', device=bot.DeviceState('test'),
+                                           chunk_size=2, **kwargs)
+            esp32.sender = sender
+            return await sender.send()
+        with mock.patch('sys.stdout'):
+            return asyncio.run(run())
+
+    def test_lost_frame_is_resent_with_the_rest_of_the_window(self):
+        esp32 = FakeEsp32(drop={2})
+        self.assertTrue(self.send(esp32, window=2, ack_timeout=0.05, max_retries=3))
+        self.assertEqual(b"".join(esp32.received), self.PAYLOAD)
+        # El 3 llegó fuera de orden y se descartó: go-back-N lo reenvía junto con el 2
+        self.assertEqual(esp32.sent_frames, [0, 1, 2, 3, 2, 3, 4])
+        self.assertEqual(esp32.messages['end'], {
+            'stream': esp32.sender.stream_id, 'frames': 5, 'bytes': 10, 'crc32': zlib.crc32(self.PAYLOAD)
+        })
+        self.assertNotIn('abort', esp32.messages)
+
+    def test_window_limits_frames_in_flight(self):
+        esp32 = FakeEsp32(acks=False)
+        self.assertFalse(self.send(esp32, window=3, ack_timeout=0.01, max_retries=2))
+        # Sin acks: la ventana inicial y luego dos reintentos desde el frame 0
+        self.assertEqual(esp32.sent_frames, [0, 1, 2, 0, 1, 2, 0, 1, 2])
+        self.assertIn('abort', esp32.messages)
+        self.assertNotIn('end', esp32.messages)
+
+    def test_without_window_sends_everything(self):
+        esp32 = FakeEsp32(acks=False)
+        self.assertTrue(self.send(esp32, window=0))
+        self.assertEqual(esp32.sent_frames, [0, 1, 2, 3, 4])
+        self.assertEqual(esp32.messages['start']['frames'], 5)
+
+if __name__ == '__main__':
+    unittest.main()